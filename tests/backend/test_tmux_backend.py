@@ -0,0 +1,96 @@
+"""Tests for TmuxBackend.complete_streaming() (ask() worker bridged by a queue)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+
+def _stream(session):
+    """complete_streaming() of a TmuxBackend wrapping the given fake session."""
+    from vibe.core.config import Backend, ModelConfig, ProviderConfig
+    from vibe.core.llm.backend.tmux import TmuxBackend
+    from vibe.core.types import LLMMessage, Role
+
+    backend = TmuxBackend(
+        ProviderConfig(name="claude", api_base="", backend=Backend.TMUX), timeout=5
+    )
+    backend._session = session
+    return backend.complete_streaming(
+        model=ModelConfig(name="claude", provider="claude", alias="claude"),
+        messages=[LLMMessage(role=Role.user, content="hi")],
+    )
+
+
+class TestCompleteStreaming:
+    """Tests for the queue / worker wait loop."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_in_order_then_stop(self):
+        """Contract: Snapshots arrive in order, then one empty 'stop' chunk.
+        If fail: Streamed response shown out of order, or the turn never ends.
+        """
+
+        class FakeSession:
+            def ask(self, prompt, timeout, on_update):
+                for text in ("a", "ab", "abc"):
+                    on_update(text)
+                return "abc"
+
+        chunks = [
+            (c.message.content, c.finish_reason) async for c in _stream(FakeSession())
+        ]
+
+        assert chunks == [("a", None), ("ab", None), ("abc", None), ("", "stop")]
+
+    @pytest.mark.asyncio
+    async def test_worker_error_raised_after_queued_chunks(self):
+        """Contract: ask() failing still delivers its queued chunks, then raises.
+        If fail: Error swallowed (turn looks finished) or partial output lost.
+        """
+
+        class FakeSession:
+            def ask(self, prompt, timeout, on_update):
+                on_update("partial")
+                raise RuntimeError("tmux gone")
+
+        received: list[str] = []
+        with pytest.raises(RuntimeError, match="tmux gone"):
+            async for chunk in _stream(FakeSession()):
+                received.append(chunk.message.content or "")
+
+        assert received == ["partial"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_leaves_no_pending_task(self):
+        """Contract: Cancelling the consumer cancels the queue and worker tasks.
+        If fail: Tasks leak on every interrupted turn ("Task was destroyed").
+        """
+        import threading
+
+        release = threading.Event()
+        first = asyncio.Event()
+
+        class FakeSession:
+            def ask(self, prompt, timeout, on_update):
+                on_update("a")
+                release.wait(timeout=5)
+                return "a"
+
+        async def consume():
+            async for _ in _stream(FakeSession()):
+                first.set()
+
+        before = asyncio.all_tasks()
+        consumer = asyncio.create_task(consume())
+        await first.wait()
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+        await asyncio.sleep(0)
+
+        try:
+            assert asyncio.all_tasks() == before
+        finally:
+            release.set()
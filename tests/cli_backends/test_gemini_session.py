@@ -0,0 +1,61 @@
+"""Tests for Gemini session extraction functions."""
+
+from __future__ import annotations
+
+
+class TestExtractResponseShellZone:
+    """Tests for shell box scoping in _extract_response()."""
+
+    def test_only_current_zone_shell_box_kept(self):
+        """Contract: Only the shell box between the last two ✦ markers is kept.
+        If fail: Old shell output pollutes the new message (B20).
+        """
+        from vibe.cli_backends.gemini.session import GeminiSessionTmux
+
+        raw = """✦ First answer.
+│ ✓ Shell ls old │
+│ old.txt │
+│ Command exited with code: 1 │
+╰────╯
+✦ Second answer.
+│ ✓ Shell ls new │
+│ new.txt │
+│ Command exited with code: 0 │
+╰────╯
+✦ Third answer."""
+
+        session = GeminiSessionTmux.__new__(GeminiSessionTmux)
+        result = session._extract_response(raw)
+
+        assert result.startswith("Third answer.")
+        assert "__SHELL_OUTPUT__:new.txt" in result
+        assert "Command exited with code: 0" in result
+        assert "old.txt" not in result
+
+    def test_shell_box_after_last_marker_ignored(self):
+        """Contract: A shell box after the last ✦ is not attached yet.
+        If fail: Output of a running command leaks into the previous response.
+        """
+        from vibe.cli_backends.gemini.session import GeminiSessionTmux
+
+        raw = """✦ Answer.
+│ ✓ Shell ls │
+│ pending.txt │"""
+
+        session = GeminiSessionTmux.__new__(GeminiSessionTmux)
+        result = session._extract_response(raw)
+
+        assert "__SHELL_OUTPUT__" not in result
+
+    def test_skip_count_hides_old_responses(self):
+        """Contract: Responses up to skip_count are treated as already seen.
+        If fail: Previous answer is returned as the new one.
+        """
+        from vibe.cli_backends.gemini.session import GeminiSessionTmux
+
+        session = GeminiSessionTmux.__new__(GeminiSessionTmux)
+
+        assert session._extract_response("✦ Old answer.", 1) == ""
+        assert session._extract_response("✦ Old answer.\n✦ New answer.", 1) == (
+            "New answer."
+        )
@@ -0,0 +1,569 @@
+"""Tests for DebateAgent helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+
+class TestMetaStrip:
+    """Tests for _META_STRIP_RE (shell marker + exit code cleanup)."""
+
+    def test_exit_code_before_shell_output(self):
+        """Contract: Exit code before the marker is removed, marker eats the rest.
+        If fail: Exit code or raw shell output visible in chat.
+        """
+        from vibe.debate.agent import _META_STRIP_RE
+
+        content = "Done.\nCommand exited with code: 0\n__SHELL_OUTPUT__:a.txt\nb.txt"
+
+        assert _META_STRIP_RE.sub("", content).strip() == "Done."
+
+    def test_shell_output_swallows_trailing_exit_code(self):
+        """Contract: Everything after __SHELL_OUTPUT__: is removed.
+        If fail: Shell output leaks into stored history.
+        """
+        from vibe.debate.agent import _META_STRIP_RE
+
+        content = "Listed files.\n__SHELL_OUTPUT__:a.txt\nCommand exited with code: 1"
+
+        assert _META_STRIP_RE.sub("", content).strip() == "Listed files."
+
+    def test_exit_code_case_insensitive(self):
+        """Contract: Exit code line is matched regardless of case.
+        If fail: 'COMMAND EXITED WITH CODE' passes through.
+        """
+        from vibe.debate.agent import _META_STRIP_RE
+
+        assert _META_STRIP_RE.sub("", "ok COMMAND EXITED WITH CODE: 2") == "ok "
+
+    def test_plain_text_untouched(self):
+        """Contract: Content without metadata is returned unchanged."""
+        from vibe.debate.agent import _META_STRIP_RE
+
+        assert _META_STRIP_RE.sub("", "Just an answer.") == "Just an answer."
+
+    def test_strip_meta_prefilter_matches_regex(self):
+        """Contract: _strip_meta() gives the same result as the regex it guards.
+        If fail: Prefilter skips a marker (raw exit code or output in chat).
+        """
+        from vibe.debate.agent import _META_STRIP_RE, _strip_meta
+
+        for content in (
+            "Just an answer.",
+            "ok command EXITED with Code: 2 done",
+            "a __SHELL_OUTPUT__:x\nCommand exited with code: 0",
+            "__shell_output__:kept",
+        ):
+            assert _strip_meta(content) == _META_STRIP_RE.sub("", content)
+
+
+class TestUnsentContext:
+    """Tests for _unsent_context() (messages already in the AI's CLI session)."""
+
+    def _agent(self, *contents: str):
+        from collections import deque
+
+        from vibe.debate.agent import DebateAgent
+        from vibe.debate.routing import Message
+
+        agent = DebateAgent.__new__(DebateAgent)
+        roles = ("user", "claude")
+        agent.messages = deque(
+            Message(role=roles[i % 2], content=c, timestamp=0)
+            for i, c in enumerate(contents)
+        )
+        agent.last_seen = {"claude": -1, "gemini": -1}
+        agent._sent_through = {"claude": -1, "gemini": -1}
+        return agent
+
+    def test_nothing_sent_yet_full_context(self):
+        """Contract: Nothing sent yet means the full context is sent.
+        If fail: AI misses the conversation it never saw.
+        """
+        agent = self._agent("hi", "hello", "now")
+
+        assert agent._unsent_context("gemini") == (
+            "[Chat context, reply to last USER message]\n"
+            "USER said hi\n\nCLAUDE said hello"
+        )
+
+    def test_sent_messages_skipped_whole(self):
+        """Contract: Already sent messages are dropped whole, reply instruction kept.
+        If fail: History resent after a cancelled confirmation, or a message cut.
+        """
+        from vibe.debate.agent import _PRIOR_CONTEXT_HEADER
+
+        agent = self._agent("first\n\nUSER said nested", "answer", "now")
+        agent._sent_through["gemini"] = 0
+
+        result = agent._unsent_context("gemini")
+
+        assert result == f"{_PRIOR_CONTEXT_HEADER}CLAUDE said answer"
+        assert result.startswith("[Chat context, reply to last USER message,")
+
+    def test_everything_sent_no_context(self):
+        """Contract: No context when the CLI already got every earlier message.
+        If fail: Same history pasted again on the next turn.
+        """
+        agent = self._agent("hi", "hello", "now")
+        agent._sent_through["gemini"] = 1
+
+        assert agent._unsent_context("gemini") == ""
+
+
+class TestBuildActionContext:
+    """Tests for _build_action_context() (B55 action summaries in history)."""
+
+    def test_diff_prefixes_and_cap(self):
+        """Contract: +/- kept, other line types become ' ', diff capped at 50.
+        If fail: Other AI sees a wrong or unbounded diff.
+        """
+        from vibe.cli.textual_ui.widgets.ai_tools import CLIToolInfo
+        from vibe.debate.agent import DebateAgent
+
+        diff = [("+", "added"), ("-", "removed"), ("?", "ctx")]
+        diff += [("+", f"line {i}") for i in range(60)]
+        tool_info = CLIToolInfo(
+            tool_type="edit", file_path="/tmp/a.py", diff_lines=diff
+        )
+
+        agent = DebateAgent.__new__(DebateAgent)
+        lines = agent._build_action_context(tool_info, "gemini").split("\n")
+
+        assert lines[0] == "[GEMINI ACTION: EDIT /tmp/a.py]"
+        assert lines[1:4] == ["+ added", "- removed", "  ctx"]
+        assert len(lines) == 1 + 50 + 1
+        assert lines[-1] == "... (13 more lines)"
+
+    def test_shell_output_capped_with_exit_code(self):
+        """Contract: Shell output capped at 20 lines, exit code appended.
+        If fail: Huge command output floods the other AI's context.
+        """
+        from vibe.cli.textual_ui.widgets.ai_tools import CLIToolInfo
+        from vibe.debate.agent import DebateAgent
+
+        tool_info = CLIToolInfo(
+            tool_type="shell",
+            file_path="ls",
+            shell_output="\n".join(f"file{i}" for i in range(25)),
+            exit_code=0,
+        )
+
+        agent = DebateAgent.__new__(DebateAgent)
+        lines = agent._build_action_context(tool_info, "claude").split("\n")
+
+        assert lines[0] == "[CLAUDE ACTION: SHELL ls]"
+        assert lines[1:21] == [f"file{i}" for i in range(20)]
+        assert lines[21:] == ["... (5 more lines)", "Exit: 0"]
+
+    def test_shell_output_trailing_newline_not_counted(self):
+        """Contract: A trailing newline is not an extra line in the count."""
+        from vibe.cli.textual_ui.widgets.ai_tools import CLIToolInfo
+        from vibe.debate.agent import DebateAgent
+
+        tool_info = CLIToolInfo(
+            tool_type="shell",
+            file_path="ls",
+            shell_output="".join(f"file{i}\n" for i in range(22)),
+        )
+
+        agent = DebateAgent.__new__(DebateAgent)
+        lines = agent._build_action_context(tool_info, "claude").split("\n")
+
+        assert lines[-1] == "... (2 more lines)"
+
+
+class TestScanPriorResult:
+    """Tests for _scan_prior_result() (chained confirmation, Gemini text)."""
+
+    def test_marker_and_exit_code(self):
+        """Contract: Output after the marker and exit code are both extracted.
+        If fail: Widget for the first chained command is empty or has no exit code.
+        """
+        from vibe.debate.agent import _scan_prior_result
+
+        exit_code, output, _ = _scan_prior_result(
+            "Done.\n__SHELL_OUTPUT__:a.txt\nb.txt\nCommand exited with code: 2"
+        )
+
+        assert exit_code == 2
+        assert output == "a.txt\nb.txt"
+
+    def test_error_exit_code_not_in_output(self):
+        """Contract: 'Error: Exit code' ends the output and gives the exit code.
+        If fail: Failed command shows no exit code.
+        """
+        from vibe.debate.agent import _scan_prior_result
+
+        exit_code, output, _ = _scan_prior_result(
+            "__SHELL_OUTPUT__:oops\nError: Exit code 1"
+        )
+
+        assert exit_code == 1
+        assert output == "oops"
+
+    def test_exit_code_line_any_case_ends_output(self):
+        """Contract: Output stops at an exit code line in any case, code extracted.
+        If fail: Upper-case exit line shown as command output, exit code missing.
+        """
+        from vibe.debate.agent import _scan_prior_result
+
+        exit_code, output, _ = _scan_prior_result(
+            "__SHELL_OUTPUT__:a.txt\ncommand EXITED with code: 4"
+        )
+
+        assert exit_code == 4
+        assert output == "a.txt"
+
+    def test_empty_output_keeps_exit_code(self):
+        """Contract: Exit code line right after the marker is the exit code.
+        If fail: Command with no output shows its exit code line as output.
+        """
+        from vibe.debate.agent import _scan_prior_result
+
+        assert _scan_prior_result("__SHELL_OUTPUT__:Command exited with code: 1") == (
+            1,
+            "",
+            "__SHELL_OUTPUT__:",
+        )
+
+    def test_no_marker_falls_back_to_clean_text(self):
+        """Contract: Without marker, output is the text minus exit code lines."""
+        from vibe.debate.agent import _scan_prior_result
+
+        exit_code, output, clean = _scan_prior_result(
+            "total 0\ncommand exited with code: 0"
+        )
+
+        assert exit_code == 0
+        assert output is None
+        assert clean == "total 0"
+
+    def test_plain_text_skips_regex(self, monkeypatch):
+        """Contract: Text without any marker is returned stripped, regex not run.
+        If fail: Literal prefilter missing or drops text on the common path.
+        """
+        from vibe.debate import agent
+
+        monkeypatch.setattr(agent, "_PRIOR_META_RE", None)
+
+        assert agent._scan_prior_result("  Exited fine.\n") == (
+            None,
+            None,
+            "Exited fine.",
+        )
+
+
+class TestStartBackends:
+    """Tests for DebateAgent.__aenter__() session startup."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_start_concurrently(self, monkeypatch):
+        """Contract: Claude and Gemini start in parallel; one failure is recorded.
+        If fail: Startup waits for both sessions in sequence (F8 / startup latency).
+        """
+        import asyncio
+
+        from vibe.core.config import Backend, ProviderConfig
+        from vibe.debate import agent as agent_module
+        from vibe.debate.agent import DebateAgent
+
+        started: list[str] = []
+        release = asyncio.Event()
+
+        class FakeBackend:
+            def __init__(self, provider, timeout):
+                self.name = provider.name
+
+            async def __aenter__(self):
+                started.append(self.name)
+                if len(started) == 2:
+                    release.set()
+                await asyncio.wait_for(release.wait(), timeout=1)
+                if self.name == "gemini":
+                    raise RuntimeError("gemini down")
+                return self
+
+        monkeypatch.setattr(agent_module, "TmuxBackend", FakeBackend)
+        agent = DebateAgent.__new__(DebateAgent)
+        agent._claude_provider = ProviderConfig(
+            name="claude", api_base="", backend=Backend.TMUX
+        )
+        agent._gemini_provider = ProviderConfig(
+            name="gemini", api_base="", backend=Backend.TMUX
+        )
+        agent._timeout = 1
+
+        async def no_cleanup():
+            return None
+
+        monkeypatch.setattr(agent, "_cleanup_orphan_sessions", no_cleanup)
+
+        await agent.__aenter__()
+
+        assert sorted(started) == ["claude", "gemini"]
+        assert agent._claude_backend is not None
+        assert agent._gemini_backend is None
+        assert agent._backend_errors == {"gemini": "gemini down"}
+
+
+def _streaming_agent(monkeypatch, *snapshots: str, prompts: list[str] | None = None):
+    """DebateAgent (no sessions) whose backend streams the given snapshots.
+
+    Prompts sent to the backend are appended to prompts, when given.
+    """
+    from collections import deque
+    from types import SimpleNamespace
+
+    from vibe.debate.agent import DebateAgent
+
+    class FakeBackend:
+        async def complete_streaming(self, **kwargs):
+            if prompts is not None:
+                prompts.append(kwargs["messages"][0].content)
+            for text in snapshots:
+                yield SimpleNamespace(
+                    finish_reason=None, message=SimpleNamespace(content=text)
+                )
+
+    agent = DebateAgent.__new__(DebateAgent)
+    agent.messages = deque(maxlen=10)
+    agent.last_seen = {"claude": -1, "gemini": -1}
+    agent._sent_through = {"claude": -1, "gemini": -1}
+    agent._emit_min_chars = 64
+    agent._emit_interval = 0.016
+    monkeypatch.setattr(agent, "_get_backend", lambda target: FakeBackend())
+    monkeypatch.setattr(agent, "_get_model_config", lambda: None)
+    return agent
+
+
+class TestRouteMessage:
+    """Tests for DebateAgent.route_message() streaming and history."""
+
+    @pytest.mark.asyncio
+    async def test_small_fast_snapshots_coalesced_last_one_flushed(self, monkeypatch):
+        """Contract: Close snapshots are merged, the final one is always emitted.
+        If fail: One UI redraw per token, or the end of the answer is never shown.
+        """
+        from vibe.core.types import AssistantEvent
+
+        agent = _streaming_agent(monkeypatch, "a", "ab", "abc ▌", "abcd")
+        agent._emit_min_chars = 3
+        agent._emit_interval = 60.0
+
+        events = [
+            (e.content, e.is_snapshot)
+            async for e in agent.route_message("hi", "claude")
+            if isinstance(e, AssistantEvent)
+        ]
+
+        assert events == [("abc", True), ("d", False)]
+        assert agent.messages[-1].content == "abcd"
+
+    @pytest.mark.asyncio
+    async def test_rewritten_snapshot_replaces(self, monkeypatch):
+        """Contract: Grown snapshot is sent as a delta, a rewritten one in full.
+        If fail: Widget shows text from two different renders spliced together.
+        """
+        from vibe.core.types import AssistantEvent
+
+        agent = _streaming_agent(monkeypatch, "Hello", "Hello world", "Hi world")
+        agent._emit_min_chars = 1
+
+        events = [
+            (e.content, e.is_snapshot)
+            async for e in agent.route_message("hi", "gemini")
+            if isinstance(e, AssistantEvent)
+        ]
+
+        assert events == [("Hello", True), (" world", False), ("Hi world", True)]
+
+    @pytest.mark.asyncio
+    async def test_clean_msg_skips_tag_parsing(self, monkeypatch):
+        """Contract: A caller-provided clean_msg is stored as-is, no re-parse.
+        If fail: Tag parsed twice per turn (app already parsed it).
+        """
+        from vibe.debate import agent as agent_module
+
+        def fail_parse(text):
+            raise AssertionError("parse_routing_tag called")
+
+        monkeypatch.setattr(agent_module, "parse_routing_tag", fail_parse)
+        agent = _streaming_agent(monkeypatch, "ok")
+
+        _ = [e async for e in agent.route_message("hi", "gemini", clean_msg="hi")]
+
+        assert [m.content for m in agent.messages] == ["hi", "ok"]
+
+    @pytest.mark.asyncio
+    async def test_no_tag_no_target_returns_without_history(self, monkeypatch):
+        """Contract: Untagged message without target yields nothing, adds nothing.
+        If fail: Message sent to a default AI instead of showing the selector.
+        """
+        agent = _streaming_agent(monkeypatch, "ok")
+
+        def no_backend(target):
+            raise AssertionError("prompt sent without a target")
+
+        monkeypatch.setattr(agent, "_get_backend", no_backend)
+
+        events = [e async for e in agent.route_message("hello there")]
+
+        assert events == []
+        assert len(agent.messages) == 0
+
+    @pytest.mark.asyncio
+    async def test_sent_messages_recorded_only_when_cli_answers(self, monkeypatch):
+        """Contract: Messages count as sent only once the CLI streamed a response.
+        If fail: After a dead session or error, next prompt drops unsent context.
+        """
+        agent = _streaming_agent(monkeypatch)
+
+        _ = [e async for e in agent.route_message("@g first")]
+
+        assert agent._sent_through["gemini"] == -1
+
+        agent = _streaming_agent(monkeypatch, "ok")
+
+        _ = [e async for e in agent.route_message("@g first")]
+
+        assert agent._sent_through["gemini"] == 0
+
+    @pytest.mark.asyncio
+    async def test_prompt_context_then_user_asks(self, monkeypatch):
+        """Contract: Prompt is 'USER asks msg', after the context when there is one.
+        If fail: Prompt format changed (B49: Gemini shell mode trigger).
+        """
+        prompts: list[str] = []
+        agent = _streaming_agent(monkeypatch, "ok", prompts=prompts)
+
+        _ = [e async for e in agent.route_message("@cc first")]
+        _ = [e async for e in agent.route_message("@g second")]
+
+        assert prompts == [
+            "USER asks first",
+            "[Chat context, reply to last USER message]\n"
+            "USER said first\n\nCLAUDE said ok\nUSER asks second",
+        ]
+
+
+class TestHistoryCap:
+    """Tests for the bounded DebateAgent.messages history."""
+
+    def test_last_seen_shifts_when_oldest_dropped(self):
+        """Contract: Dropping the oldest message moves last_seen down, floor -1.
+        If fail: AI gets context it already saw, or misses new messages.
+        """
+        from collections import deque
+
+        from vibe.debate.agent import DebateAgent
+        from vibe.debate.routing import Message, build_context
+
+        agent = DebateAgent.__new__(DebateAgent)
+        agent.messages = deque(maxlen=3)
+        agent.last_seen = {"claude": 2, "gemini": 0}
+        agent._sent_through = {"claude": -1, "gemini": 1}
+
+        for i in range(3):
+            agent._append_message(Message(role="user", content=f"m{i}", timestamp=0))
+        agent._append_message(Message(role="gemini", content="m3", timestamp=0))
+
+        assert [m.content for m in agent.messages] == ["m1", "m2", "m3"]
+        assert agent.last_seen == {"claude": 1, "gemini": -1}
+        assert agent._sent_through == {"claude": -1, "gemini": 0}
+        assert build_context(agent.messages, "claude", agent.last_seen) == (
+            "[Chat context, reply to last USER message]\nGEMINI said m3"
+        )
+
+
+class TestHandleConfirmation:
+    """Tests for DebateAgent.handle_confirmation() result dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_chained_confirmation_fills_prior_shell_result(self, monkeypatch):
+        """Contract: Chained confirmation sets cmd1 exit code/output, yields its widget.
+        If fail: First command of a chain shows no output or exit code (B67).
+        """
+        from collections import deque
+
+        from vibe.cli.textual_ui.widgets.ai_tools import CLIToolInfo
+        from vibe.cli_backends.models import ParsedConfirmation, ParsedResponse
+        from vibe.core.types import AssistantEvent, CLIToolResultEvent
+        from vibe.debate.agent import DebateAgent
+
+        class FakeBackend:
+            async def respond_confirmation(self, choice):
+                pass
+
+            async def wait_response(self, timeout):
+                return ParsedConfirmation(
+                    context="cmd2 box",
+                    prior_result=ParsedResponse(
+                        content="__SHELL_OUTPUT__:a.txt\nCommand exited with code: 3"
+                    ),
+                )
+
+        class FakeParser:
+            def parse(self, context, debug=False):
+                return None, CLIToolInfo(tool_type="shell", file_path="cmd2")
+
+        cmd1 = CLIToolInfo(tool_type="shell", file_path="ls")
+        agent = DebateAgent.__new__(DebateAgent)
+        agent.messages = deque(maxlen=10)
+        agent._action_contexts = []
+        agent._pending_confirmation = {"target": "gemini", "context": "cmd1 box"}
+        agent._pending_tool_info = cmd1
+        agent._timeout = 1
+        monkeypatch.setattr(agent, "_get_backend", lambda target: FakeBackend())
+        monkeypatch.setattr(agent, "_get_parser", lambda target: FakeParser())
+
+        widget_event, notice = [
+            e async for e in agent.handle_confirmation(approved=True)
+        ]
+
+        assert (cmd1.exit_code, cmd1.shell_output) == (3, "a.txt")
+        assert isinstance(widget_event, CLIToolResultEvent)
+        assert widget_event.tool_info is cmd1
+        assert isinstance(notice, AssistantEvent)
+        assert notice.content == "[Another confirmation required]"
+        assert agent._pending_tool_info.file_path == "cmd2"
+        assert agent._action_contexts == ["[GEMINI ACTION: SHELL ls]\na.txt\nExit: 3"]
+
+    @pytest.mark.asyncio
+    async def test_final_response_joins_chain_actions_into_history(self, monkeypatch):
+        """Contract: Final response stores content plus every chained action context.
+        If fail: Other AI never sees the diffs/outputs of the chain (B55).
+        """
+        from collections import deque
+
+        from vibe.cli.textual_ui.widgets.ai_tools import CLIToolInfo
+        from vibe.cli_backends.models import ParsedResponse
+        from vibe.core.types import AssistantEvent
+        from vibe.debate.agent import DebateAgent
+
+        class FakeBackend:
+            async def respond_confirmation(self, choice):
+                pass
+
+            async def wait_response(self, timeout):
+                return ParsedResponse(content="Done.", exit_code=0, shell_output="ok")
+
+        agent = DebateAgent.__new__(DebateAgent)
+        agent.messages = deque(maxlen=10)
+        agent.last_seen = {"claude": -1, "gemini": -1}
+        agent._action_contexts = ["[GEMINI ACTION: SHELL ls]\na.txt\nExit: 3"]
+        agent._pending_confirmation = {"target": "gemini", "context": "cmd2 box"}
+        agent._pending_tool_info = CLIToolInfo(tool_type="shell", file_path="cmd2")
+        agent._timeout = 1
+        monkeypatch.setattr(agent, "_get_backend", lambda target: FakeBackend())
+
+        (event,) = [e async for e in agent.handle_confirmation(approved=True)]
+
+        assert isinstance(event, AssistantEvent)
+        assert event.content == "Done."
+        assert agent.messages[-1].content == (
+            "Done.\n\n[GEMINI ACTION: SHELL ls]\na.txt\nExit: 3"
+            "\n\n[GEMINI ACTION: SHELL cmd2]\nok\nExit: 0"
+        )
+        assert agent._action_contexts == []
+        assert agent.last_seen["gemini"] == 0
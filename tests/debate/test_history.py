@@ -0,0 +1,25 @@
+"""Tests for ConversationHistory."""
+
+from __future__ import annotations
+
+
+class TestConversationHistoryCap:
+    """Tests for trimming at max_messages."""
+
+    def test_oldest_dropped_and_last_seen_shifted(self):
+        """Contract: Past the cap the oldest goes, last_seen follows (floor -1).
+        If fail: AI re-reads seen messages, or skips the oldest unseen one.
+        """
+        from vibe.debate.history import ConversationHistory
+
+        history = ConversationHistory(max_messages=2)
+        history.add_message("user", "a")
+        history.mark_seen("claude")  # saw index 0
+        history.add_message("claude", "b")
+        history.add_message("user", "c")
+
+        assert [m.content for m in history] == ["b", "c"]
+        assert history.last_seen == {"claude": -1, "gemini": -1}
+        assert history.get_context_for("gemini") == (
+            "[Chat context, reply to last USER message]\nCLAUDE said b\n\nUSER said c"
+        )
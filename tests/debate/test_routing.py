@@ -0,0 +1,75 @@
+"""Tests for debate routing (tag parsing, context building)."""
+
+from __future__ import annotations
+
+
+class TestParseRoutingTag:
+    """Tests for parse_routing_tag()."""
+
+    def test_leading_tag_fast_path(self):
+        """Contract: Leading tag gives target, rest is whitespace-collapsed.
+        If fail: Message routed to wrong AI or sent with the tag in it.
+        """
+        from vibe.debate.routing import parse_routing_tag
+
+        assert parse_routing_tag("  @CC  fix   the\tbug ") == ("claude", "fix the bug")
+        assert parse_routing_tag("@g") == ("gemini", "")
+
+    def test_tag_mid_message_and_extra_tags(self):
+        """Contract: First tag anywhere wins, every tag is removed from the text.
+        If fail: Regex fallback broken (tag not first word, or several tags).
+        """
+        from vibe.debate.routing import parse_routing_tag
+
+        assert parse_routing_tag("ask @gemini please") == ("gemini", "ask please")
+        assert parse_routing_tag("@cc ask @g too") == ("claude", "ask too")
+
+    def test_no_tag(self):
+        """Contract: No tag returns None and the stripped text (emails kept)."""
+        from vibe.debate.routing import parse_routing_tag
+
+        assert parse_routing_tag(" mail me@cc.org ") == (None, "mail me@cc.org")
+        assert parse_routing_tag("") == (None, "")
+
+
+class TestBuildContext:
+    """Tests for build_context()."""
+
+    def test_format_skips_seen_and_ephemeral(self):
+        """Contract: Header, then unseen non-ephemeral messages, blank line between.
+        If fail: AI gets messages twice, UI-only messages, or a malformed context.
+        """
+        from vibe.debate.routing import Message, build_context
+
+        messages = [
+            Message(role="user", content="seen", timestamp=0),
+            Message(role="claude", content="answer", timestamp=0),
+            Message(role="user", content="note", timestamp=0, is_ephemeral=True),
+            Message(role="gemini", content="other", timestamp=0),
+            Message(role="user", content="now", timestamp=0),
+        ]
+
+        assert build_context(messages, "claude", {"claude": 1}) == (
+            "[Chat context, reply to last USER message]\n"
+            "GEMINI said other\n\nUSER said now"
+        )
+        assert build_context(messages, "claude", {"claude": 4}) == ""
+
+
+class TestMessage:
+    """Tests for Message."""
+
+    def test_make_stamps_now(self):
+        """Contract: Message.make() stamps time_ns() now, not ephemeral by default.
+        If fail: Messages stored without or with a wrong-unit timestamp.
+        """
+        import time
+
+        from vibe.debate.routing import Message
+
+        before = time.time_ns()
+        msg = Message.make("user", "hi")
+
+        assert (msg.role, msg.content, msg.is_ephemeral) == ("user", "hi", False)
+        assert before <= msg.timestamp <= time.time_ns()
+        assert Message.make("user", "note", is_ephemeral=True).is_ephemeral
@@ -400,11 +400,16 @@ class VibeApp(App):  # noqa: PLR0904
             messages_area = self.query_one("#messages")
             await messages_area.mount(widget)
 
-            # Stream response (use replace_content for tmux polling)
-            async for event in self._debate_agent.route_message(user_message, target):
-                if isinstance(event, AssistantEvent):
-                    if event.content:
+            # Stream response (deltas are appended, re-rendered snapshots replace)
+            # user_message is already tag-free (parsed in _handle_user_message)
+            async for event in self._debate_agent.route_message(
+                user_message, target, clean_msg=user_message
+            ):
+                if isinstance(event, AssistantEvent) and event.content:
+                    if event.is_snapshot:
                         await widget.replace_content(event.content)
+                    else:
+                        await widget.append_content(event.content)
 
             await widget.stop_stream()
 
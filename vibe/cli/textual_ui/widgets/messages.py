@@ -188,6 +188,8 @@ class ClaudeMessage(Static):
         if not content or content == self._content:
             return
         self._content = content
+        # Let queued appends land first, they would end up after the rewrite
+        await self.stop_stream()
         # Reset markdown and rewrite
         md = self._get_markdown()
         await md.update(content)
@@ -244,6 +246,8 @@ class GeminiMessage(Static):
         if not content or content == self._content:
             return
         self._content = content
+        # Let queued appends land first, they would end up after the rewrite
+        await self.stop_stream()
         md = self._get_markdown()
         await md.update(content)
 
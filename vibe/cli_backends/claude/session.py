@@ -314,12 +314,15 @@ class ClaudeSessionTmux:
                 last_text_idx = i
 
         if last_text_idx == -1:
-            logger.debug(
-                "Parse failed: no text marker (●) found. %s chars, %s lines. Preview: %s",
-                len(raw) if raw else 0,
-                raw.count("\n") + 1 if raw else 0,
-                repr(raw[:200]) if raw else "EMPTY",
-            )
+            # Runs on every poll until ● appears: only count/repr the pane if logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Parse failed: no text marker (●) found. %s chars, %s lines. "
+                    "Preview: %s",
+                    len(raw) if raw else 0,
+                    raw.count("\n") + 1 if raw else 0,
+                    repr(raw[:200]) if raw else "EMPTY",
+                )
             return "", -1
 
         # B35 fix: Same index as previous poll = old message, return empty
@@ -3,35 +3,120 @@ from __future__ import annotations
 from collections.abc import Callable
 import logging
 import re
+import shutil
 import subprocess
 import time
 from typing import Any
 
 from vibe.cli_backends.gemini.parser import GeminiToolParser
-from vibe.cli_backends.models import ParsedConfirmation, ParsedResponse
+from vibe.cli_backends.models import (
+    SHELL_OUTPUT_MARKER,
+    ParsedConfirmation,
+    ParsedResponse,
+)
+
+# Resolved once instead of a $PATH lookup on every subprocess call
+_TMUX = shutil.which("tmux") or "tmux"
+
+# Response markers (✦ answer, ✧ thinking), counted in one scan per poll.
+# Panes are captured as bytes, so match their UTF-8 encoding (E2 9C A6/A7).
+_MARKER_COUNT_RE = re.compile(rb"\xe2\x9c[\xa6\xa7]")
+
+# Busy indicators (spinner, "esc to cancel") only live on the active screen at
+# the bottom of the pane: search the tail instead of the whole scrollback.
+# 8 KB covers the spinner line plus the input box (~600 bytes per box row).
+_SPINNER_RE = re.compile(b"|".join(s.encode() for s in "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"))
+_ACTIVE_TAIL_BYTES = 8192
+
+
+def _is_busy(raw: bytes) -> bool:
+    """Check if Gemini is still generating (spinner or cancel hint visible)."""
+    tail = raw[-_ACTIVE_TAIL_BYTES:]
+    return _SPINNER_RE.search(tail) is not None or b"esc to cancel" in tail
+
+
+# Pre-compiled noise patterns for _extract_response() (same idea as Claude's R3)
+_NOISE_PATTERNS: tuple[re.Pattern[str], ...] = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"^───+$",
+        r"Type your message",
+        r"esc to cancel",
+        r"auto \|",
+        r"sandbox",
+        r"GEMINI\.md",
+        r"^Using:",
+        r"YOLO mode",
+        r"^╭─+╮?$",
+        r"^╰─+╯?$",  # Input box borders
+        r"^│\s*>\s*Type your",
+        r"^│\s*$",  # Empty box lines
+        # Tool execution noise (B49 fix attempt)
+        r"Responding with gemini",
+        r"Waiting for user confirmation",
+        r"Request cancelled",
+        r"^│\s*[✓⊷\-\+\?]\s*(ReadFile|WriteFile|EditFile|DeleteFile|Shell)",
+        r"^│\s*\d+\s*[\-\+]",  # Diff lines inside boxes
+        # NOTE: Tool box chars still captured in shell_output_lines section
+    )
+)
+
+# Box borders and padding around shell output lines (both ends, one pass)
+_BOX_EDGE_RE = re.compile(r"^[│\s]+|[│\s]+$")
+
+
+def _decode_pane(raw: bytes) -> str:
+    """Decode a captured pane. Only done for polls that actually get parsed."""
+    return raw.decode("utf-8", errors="replace")
 
 
 class GeminiSessionTmux:
     def __init__(self, session_name: str = "gemini_session") -> None:
         self.session_name = session_name
         self._parser = GeminiToolParser()
+        # Fixed argv for the polling hot path, built once per session
+        self._argv_capture = (
+            _TMUX,
+            "capture-pane",
+            "-t",
+            session_name,
+            "-p",
+            "-S",
+            "-500",
+        )
+        self._argv_has_session = (_TMUX, "has-session", "-t", session_name)
+        self._argv_send_enter = (_TMUX, "send-keys", "-t", session_name, "Enter")
+        self._argv_send_escape = (_TMUX, "send-keys", "-t", session_name, "Escape")
+
+    def _capture_pane(self, lines: int = 500) -> bytes | None:
+        """Capture raw tmux pane bytes. Returns None if session dead (B59).
 
-    def _capture_pane(self, lines: int = 500) -> str | None:
-        """Capture tmux pane content. Returns None if session dead (B59)."""
-        cmd = ["tmux", "capture-pane", "-t", self.session_name, "-p", "-S", f"-{lines}"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        Left undecoded so unchanged polls never pay for UTF-8 decoding.
+        """
+        cmd = self._argv_capture
+        if lines != 500:
+            cmd = (
+                _TMUX,
+                "capture-pane",
+                "-t",
+                self.session_name,
+                "-p",
+                "-S",
+                f"-{lines}",
+            )
+        result = subprocess.run(cmd, capture_output=True)
         if result.returncode != 0:
             return None
         return result.stdout
 
     def start(self) -> None:
         subprocess.run(
-            ["tmux", "kill-session", "-t", self.session_name], capture_output=True
+            [_TMUX, "kill-session", "-t", self.session_name], capture_output=True
         )
         # B49: Use gemini-2.5-flash instead of flash-lite (more stable, less shell mode bugs)
         # B69: Set SHELL=/bin/bash to prevent user shell config pollution (banners, hooks)
         subprocess.run([
-            "tmux",
+            _TMUX,
             "new-session",
             "-d",
             "-s",
@@ -51,7 +136,7 @@ class GeminiSessionTmux:
         for _ in range(15):
             time.sleep(1)
             result = subprocess.run(
-                ["tmux", "capture-pane", "-t", self.session_name, "-p"],
+                [_TMUX, "capture-pane", "-t", self.session_name, "-p"],
                 capture_output=True,
                 text=True,
             )
@@ -66,9 +151,7 @@ class GeminiSessionTmux:
         on_update: Callable[[str], Any] | None = None,
     ) -> str | ParsedConfirmation:
         try:
-            check = subprocess.run(
-                ["tmux", "has-session", "-t", self.session_name], capture_output=True
-            )
+            check = subprocess.run(self._argv_has_session, capture_output=True)
             if check.returncode != 0:
                 return "❌ Tmux session dead. Click Restart."
 
@@ -76,24 +159,16 @@ class GeminiSessionTmux:
             # B59: Detect dead session (unlikely after has-session check, but safe)
             if before is None:
                 return "❌ Gemini crashed. Restart TheOne to recover."
-            responses_before = before.count("✦") + before.count("✧")
+            responses_before = len(_MARKER_COUNT_RE.findall(before))
 
             # B49 fix: load-buffer + paste-buffer with -p (bracketed paste) and -r (preserve newlines)
-            subprocess.run(["tmux", "load-buffer", "-"], input=prompt.encode("utf-8"))
-            subprocess.run([
-                "tmux",
-                "paste-buffer",
-                "-p",
-                "-r",
-                "-t",
-                self.session_name,
-            ])
+            subprocess.run([_TMUX, "load-buffer", "-"], input=prompt.encode("utf-8"))
+            subprocess.run([_TMUX, "paste-buffer", "-p", "-r", "-t", self.session_name])
             time.sleep(0.3)
-            subprocess.run(["tmux", "send-keys", "-t", self.session_name, "Enter"])
+            subprocess.run(self._argv_send_enter)
 
             start_time = time.time()
-            spinners = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-            last_output = ""  # B44/B53: Cache to skip parse if buffer unchanged
+            last_output = b""  # B44/B53: Cache to skip parse if buffer unchanged
 
             while time.time() - start_time < timeout:
                 time.sleep(1)
@@ -111,7 +186,9 @@ class GeminiSessionTmux:
                     if output == last_output:
                         continue
 
-                    partial = self._extract_response(output, responses_before)
+                    partial = self._extract_response(
+                        _decode_pane(output), responses_before
+                    )
                     t_parse = time.time()
 
                     # Log if polling took > 500ms (potential UI freeze cause)
@@ -125,30 +202,29 @@ class GeminiSessionTmux:
                     last_output = output  # Update cache
 
                 if (
-                    "Waiting for user confirmation" in output
-                    or "Apply this change?" in output
+                    b"Waiting for user confirmation" in output
+                    or b"Apply this change?" in output
                 ):
                     # TODO B44: Log before returning confirmation to trace freeze
                     logging.debug(
                         "B44: Gemini confirmation detected, returning to agent"
                     )
                     return ParsedConfirmation(
-                        context=self._extract_confirmation_context(output)
+                        context=self._extract_confirmation_context(_decode_pane(output))
                     )
 
-                responses_now = output.count("✦") + output.count("✧")
+                responses_now = len(_MARKER_COUNT_RE.findall(output))
 
-                if responses_now > responses_before and "Type your message" in output:
-                    if (
-                        not any(s in output for s in spinners)
-                        and "esc to cancel" not in output
-                    ):
+                if responses_now > responses_before and b"Type your message" in output:
+                    if not _is_busy(output):
                         time.sleep(1)
                         output = self._capture_pane()
                         # B59: Detect dead session
                         if output is None:
                             return "❌ Gemini crashed. Restart TheOne to recover."
-                        return self._extract_response(output, responses_before)
+                        return self._extract_response(
+                            _decode_pane(output), responses_before
+                        )
 
             return "⚠️ Timeout"
 
@@ -163,105 +239,76 @@ class GeminiSessionTmux:
         NOTE: Box characters (╭─│╰) are KEPT in output so GeminiToolParser
         can extract file paths and diffs. Only noise patterns are stripped.
         """
-        noise_patterns = [
-            r"^───+$",
-            r"Type your message",
-            r"esc to cancel",
-            r"auto \|",
-            r"sandbox",
-            r"GEMINI\.md",
-            r"^Using:",
-            r"YOLO mode",
-            r"^╭─+╮?$",
-            r"^╰─+╯?$",  # Input box borders
-            r"^│\s*>\s*Type your",
-            r"^│\s*$",  # Empty box lines
-            # Tool execution noise (B49 fix attempt)
-            r"Responding with gemini",
-            r"Waiting for user confirmation",
-            r"Request cancelled",
-            r"^│\s*[✓⊷\-\+\?]\s*(ReadFile|WriteFile|EditFile|DeleteFile|Shell)",
-            r"^│\s*\d+\s*[\-\+]",  # Diff lines inside boxes
-            # NOTE: Tool box chars still captured in shell_output_lines section
-        ]
-
         lines = raw.strip().split("\n")
         all_responses = []
         current_response = []
         in_response = False
 
-        # B12 fix: Find response markers to scope shell box search
-        # Gemini format: ╭box with exit code╯ ✦ response text
-        response_markers = []
-        for i, line in enumerate(lines):
-            if line.strip().startswith("✦") or line.strip().startswith("✧"):
-                response_markers.append(i)
-
-        last_response_idx = response_markers[-1] if response_markers else 0
-
-        # B20 fix: Only search between second-last and last ✦ (current response zone)
-        # Prevents old shell boxes from polluting new messages
+        # B12/B20 fix: Only keep the shell box between the second-last and last
+        # ✦ (current response zone), so old shell boxes don't pollute new
+        # messages. Gemini format: ╭box with exit code╯ ✦ response text
+        # Single pass: each ✦/✧ commits the zone it closes and starts a new one.
+        markers_seen = 0
         exit_code_line = None
         shell_output_lines = []
-        if len(response_markers) > 1:
-            search_start = response_markers[-2]
-        else:
-            search_start = max(0, last_response_idx - 210)
         in_shell_box = False
+        zone_box_start = -1
+        zone_exit_code_line = None
+        zone_output_lines = []
 
-        for line in lines[search_start : last_response_idx + 1]:
+        for i, line in enumerate(lines):
             stripped = line.strip()
-            # Clean box chars for content check
-            clean_line = re.sub(r"^[│\s]+", "", stripped)
-            clean_line = re.sub(r"[│\s]+$", "", clean_line)
+            is_shell_start = "✓" in stripped and "Shell" in stripped
 
-            # Detect shell box start - reset output for each new box
-            if "✓" in stripped and "Shell" in stripped:
-                in_shell_box = True
-                shell_output_lines = []  # Reset for this box
-                exit_code_line = None  # Reset exit code too
-                continue
+            if stripped.startswith(("✦", "✧")):
+                # Before the first marker, only the last 210 lines are searched
+                if is_shell_start or (not markers_seen and zone_box_start < i - 210):
+                    exit_code_line, shell_output_lines = None, []
+                else:
+                    exit_code_line = zone_exit_code_line
+                    shell_output_lines = zone_output_lines
+                markers_seen += 1
+                in_shell_box = is_shell_start
+                zone_box_start = i if is_shell_start else -1
+                zone_exit_code_line = None
+                zone_output_lines = []
 
-            # Detect box end
-            if (
-                stripped.startswith("╰")
-                or stripped.startswith("✦")
-                or stripped.startswith("✧")
-            ):
-                in_shell_box = False
+                if current_response:
+                    all_responses.append("\n".join(current_response))
+                text = stripped[1:].lstrip()  # Drop the ✦/✧ marker
+                current_response = [text] if text else []
+                in_response = True
                 continue
 
-            if in_shell_box and clean_line:
+            # Detect shell box start - reset output for each new box
+            if is_shell_start:
+                in_shell_box = True
+                zone_box_start = i
+                zone_exit_code_line = None
+                zone_output_lines = []
+            elif stripped.startswith("╰"):
+                # Detect box end
+                in_shell_box = False
+            elif in_shell_box:
+                # Clean box chars for content check
+                clean_line = _BOX_EDGE_RE.sub("", stripped)
                 if (
                     "Command exited with code:" in clean_line
                     or "Error: Exit code" in clean_line
                 ):
-                    exit_code_line = clean_line
-                elif not clean_line.startswith("╭"):
+                    zone_exit_code_line = clean_line
+                elif clean_line and not clean_line.startswith("╭"):
                     # This is output content
-                    shell_output_lines.append(clean_line)
-
-        for line in lines:
-            stripped = line.strip()
+                    zone_output_lines.append(clean_line)
 
-            if stripped.startswith("✦") or stripped.startswith("✧"):
-                if current_response:
-                    all_responses.append("\n".join(current_response))
-                text = re.sub(r"^[✦✧]\s*", "", stripped)
-                current_response = [text] if text else []
-                in_response = True
-            elif in_response:
+            if in_response:
                 if "Type your message" in stripped:
                     if current_response:
                         all_responses.append("\n".join(current_response))
                         current_response = []
                     in_response = False
-                else:
-                    is_noise = any(
-                        re.search(p, stripped, re.IGNORECASE) for p in noise_patterns
-                    )
-                    if not is_noise and stripped:
-                        current_response.append(stripped)
+                elif stripped and not any(p.search(stripped) for p in _NOISE_PATTERNS):
+                    current_response.append(stripped)
 
         # Only add current_response if we're actually in a response (after ✦)
         if current_response and in_response:
@@ -273,7 +320,7 @@ class GeminiSessionTmux:
 
         # B12/B13 fix: For shell, add markers for widget (but keep text response)
         if shell_output_lines:
-            shell_marker = f"__SHELL_OUTPUT__:{chr(10).join(shell_output_lines)}"
+            shell_marker = f"{SHELL_OUTPUT_MARKER}{chr(10).join(shell_output_lines)}"
             if exit_code_line:
                 shell_marker = f"{shell_marker}\n{exit_code_line}"
             # Append marker AFTER result so regex cleanup preserves text response
@@ -318,17 +365,16 @@ class GeminiSessionTmux:
 
     def respond_confirmation(self, choice: str) -> None:
         if choice == "yes":
-            subprocess.run(["tmux", "send-keys", "-t", self.session_name, "Enter"])
+            subprocess.run(self._argv_send_enter)
         else:
-            subprocess.run(["tmux", "send-keys", "-t", self.session_name, "Escape"])
+            subprocess.run(self._argv_send_escape)
 
     def wait_response(
         self, timeout: int = 120, on_update: Callable[[str], Any] | None = None
     ) -> ParsedResponse | ParsedConfirmation:
         start_time = time.time()
-        spinners = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
         last_partial = ""
-        last_output = ""  # B44/B53: Cache to skip parse if buffer unchanged
+        last_output = b""  # B44/B53: Cache to skip parse if buffer unchanged
 
         before = self._capture_pane()
         # B59: Detect dead session
@@ -336,7 +382,7 @@ class GeminiSessionTmux:
             return ParsedResponse(
                 content="❌ Gemini crashed. Restart TheOne to recover."
             )
-        responses_before = before.count("✦") + before.count("✧")
+        responses_before = len(_MARKER_COUNT_RE.findall(before))
 
         while time.time() - start_time < timeout:
             time.sleep(1)
@@ -352,7 +398,9 @@ class GeminiSessionTmux:
                 if output == last_output:
                     continue
 
-                partial = self._extract_response(output, responses_before - 1)
+                partial = self._extract_response(
+                    _decode_pane(output), responses_before - 1
+                )
                 if partial and partial != last_partial:
                     on_update(partial + " ▌")
                     last_partial = partial
@@ -360,11 +408,12 @@ class GeminiSessionTmux:
                 last_output = output  # Update cache
 
             if (
-                "Waiting for user confirmation" in output
-                or "Apply this change?" in output
+                b"Waiting for user confirmation" in output
+                or b"Apply this change?" in output
             ):
+                text = _decode_pane(output)
                 # Extract result before confirmation (for chained commands)
-                prior_result = self._extract_response(output, responses_before - 1)
+                prior_result = self._extract_response(text, responses_before - 1)
                 # Parse structured data (align with Claude)
                 prior_exit_code, prior_shell_output = (
                     self._parser.parse_tool_result(prior_result)
@@ -372,7 +421,7 @@ class GeminiSessionTmux:
                     else (None, None)
                 )
                 return ParsedConfirmation(
-                    context=self._extract_confirmation_context(output),
+                    context=self._extract_confirmation_context(text),
                     prior_result=ParsedResponse(content=prior_result)
                     if prior_result
                     else None,
@@ -380,20 +429,17 @@ class GeminiSessionTmux:
                     prior_shell_output=prior_shell_output,
                 )
 
-            if "Type your message" in output:
-                if (
-                    not any(s in output for s in spinners)
-                    and "esc to cancel" not in output
-                ):
-                    content = self._extract_response(output, responses_before - 1)
+            if b"Type your message" in output:
+                if not _is_busy(output):
+                    content = self._extract_response(
+                        _decode_pane(output), responses_before - 1
+                    )
 
                     # Parse structured data from content (uses parser)
                     exit_code, shell_output = self._parser.parse_tool_result(content)
                     # Clean content (remove markers)
                     if isinstance(content, str):
-                        content = re.sub(
-                            r"__SHELL_OUTPUT__:.*", "", content, flags=re.DOTALL
-                        ).strip()
+                        content = content.partition(SHELL_OUTPUT_MARKER)[0].strip()
 
                     return ParsedResponse(
                         content=content, exit_code=exit_code, shell_output=shell_output
@@ -403,18 +449,16 @@ class GeminiSessionTmux:
 
     def interrupt(self) -> None:
         """Send Escape to stop generation (no-op if not generating)."""
-        subprocess.run(["tmux", "send-keys", "-t", self.session_name, "Escape"])
+        subprocess.run(self._argv_send_escape)
 
     def is_alive(self) -> bool:
         """B59: Check if tmux session is still running."""
-        result = subprocess.run(
-            ["tmux", "has-session", "-t", self.session_name], capture_output=True
-        )
+        result = subprocess.run(self._argv_has_session, capture_output=True)
         return result.returncode == 0
 
     def close(self) -> None:
-        subprocess.run(["tmux", "send-keys", "-t", self.session_name, "/exit", "Enter"])
+        subprocess.run([_TMUX, "send-keys", "-t", self.session_name, "/exit", "Enter"])
         time.sleep(1)
         subprocess.run(
-            ["tmux", "kill-session", "-t", self.session_name], capture_output=True
+            [_TMUX, "kill-session", "-t", self.session_name], capture_output=True
         )
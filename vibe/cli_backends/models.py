@@ -8,8 +8,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+# Sentinel appended by sessions before raw shell output (widget data, not chat)
+SHELL_OUTPUT_MARKER = "__SHELL_OUTPUT__:"
 
-@dataclass
+
+@dataclass(slots=True)
 class ParsedResponse:
     """Response from CLI session after command execution.
 
@@ -21,7 +24,7 @@ class ParsedResponse:
     shell_output: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedConfirmation:
     """Confirmation request from CLI requiring user approval.
 
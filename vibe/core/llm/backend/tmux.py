@@ -30,6 +30,8 @@ class TmuxBackend:
         self._timeout = timeout
         self._session: Any = None
         self._session_class: type | None = None
+        # LLMUsage is frozen, so one instance is shared by every emitted chunk
+        self._empty_usage = LLMUsage()
 
     def _get_session_class(self) -> type:
         """Lazy import session class based on provider name."""
@@ -102,14 +104,14 @@ class TmuxBackend:
         if isinstance(response, ParsedConfirmation):
             return LLMChunk(
                 message=LLMMessage(role=Role.assistant, content=""),
-                usage=LLMUsage(),
+                usage=self._empty_usage,
                 finish_reason="confirmation",
             )
 
         content = response if isinstance(response, str) else str(response)
         return LLMChunk(
             message=LLMMessage(role=Role.assistant, content=content),
-            usage=LLMUsage(),
+            usage=self._empty_usage,
             finish_reason="stop",
         )
 
@@ -142,29 +144,39 @@ class TmuxBackend:
             return result
 
         task = asyncio.create_task(run_ask())
-        final_result: Any = None
 
-        while True:
-            try:
-                chunk = await asyncio.wait_for(queue.get(), timeout=0.1)
+        # Wake up on the next chunk or when the worker exits, never on a timer
+        get_task = asyncio.create_task(queue.get())
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {get_task, task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if get_task in done:
+                    chunk = get_task.result()
+                    get_task = asyncio.create_task(queue.get())
+                elif queue.empty():
+                    break  # Worker failed before sending the completion signal
+                else:
+                    chunk = queue.get_nowait()  # Drain what the worker left
                 if chunk is None:
                     break
                 if isinstance(chunk, str):
                     yield LLMChunk(
                         message=LLMMessage(role=Role.assistant, content=chunk),
-                        usage=LLMUsage(),
+                        usage=self._empty_usage,
                         finish_reason=None,
                     )
-            except TimeoutError:
-                if task.done():
-                    break
-                continue
+        except BaseException:
+            # Consumer cancelled or closed the stream: don't leave the worker
+            # task pending (the ask() thread itself runs to completion)
+            task.cancel()
+            raise
+        finally:
+            get_task.cancel()
 
-        # Get final result
-        try:
-            final_result = await task
-        except Exception:
-            pass
+        # Get final result (re-raises if ask() failed, after its queued chunks)
+        final_result: Any = await task
 
         # Handle confirmation
         if isinstance(final_result, ParsedConfirmation):
@@ -172,13 +184,13 @@ class TmuxBackend:
             context = final_result.context
             yield LLMChunk(
                 message=LLMMessage(role=Role.assistant, content=context),
-                usage=LLMUsage(),
+                usage=self._empty_usage,
                 finish_reason="confirmation",
             )
         else:
             yield LLMChunk(
                 message=LLMMessage(role=Role.assistant, content=""),
-                usage=LLMUsage(),
+                usage=self._empty_usage,
                 finish_reason="stop",
             )
 
@@ -193,11 +205,7 @@ class TmuxBackend:
         extra_headers: dict[str, str] | None = None,
     ) -> int:
         """Estimate token count (rough: chars / 4)."""
-        total = 0
-        for msg in messages:
-            if msg.content:
-                total += len(msg.content)
-        return total // 4
+        return sum(len(msg.content) for msg in messages if msg.content) // 4
 
     async def is_alive(self) -> bool:
         """B59: Check if tmux session is still running."""
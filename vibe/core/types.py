@@ -225,6 +225,9 @@ class BaseEvent(BaseModel, ABC):
 class AssistantEvent(BaseEvent):
     content: str
     stopped_by_middleware: bool = False
+    # True: content is the full text so far and replaces what was shown
+    # (debate tmux snapshots); by default content is a delta to append
+    is_snapshot: bool = False
 
 
 class ToolCallEvent(BaseEvent):
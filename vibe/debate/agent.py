@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from collections.abc import AsyncGenerator
-from datetime import datetime
+from itertools import islice
 import logging
 import re
 import subprocess
@@ -14,7 +15,11 @@ from typing import TYPE_CHECKING
 from vibe.cli.textual_ui.widgets.ai_tools import CLIToolInfo
 from vibe.cli_backends.claude.parser import ClaudeToolParser
 from vibe.cli_backends.gemini.parser import GeminiToolParser
-from vibe.cli_backends.models import ParsedConfirmation, ParsedResponse
+from vibe.cli_backends.models import (
+    SHELL_OUTPUT_MARKER,
+    ParsedConfirmation,
+    ParsedResponse,
+)
 from vibe.core.config import Backend, ProviderConfig
 from vibe.core.llm.backend.tmux import TmuxBackend
 from vibe.core.types import (
@@ -24,20 +29,124 @@ from vibe.core.types import (
     LLMMessage,
     Role,
 )
-from vibe.debate.routing import Message, build_context, parse_routing_tag
+from vibe.debate.routing import (
+    TARGET_CLAUDE,
+    TARGET_GEMINI,
+    Message,
+    build_context,
+    parse_routing_tag,
+)
 
 if TYPE_CHECKING:
     from vibe.core.config import ModelConfig, VibeConfig
 
 logger = logging.getLogger(__name__)
 
+# Diff line types kept as-is in action contexts (others become " ")
+_DIFF_PREFIXES = frozenset("+-")
+# Action context headers: fixed targets, no per-call upper()
+_TARGET_UPPER = {TARGET_CLAUDE: "CLAUDE", TARGET_GEMINI: "GEMINI"}
+
+# Context header when earlier messages are already in the CLI session
+# B49: No colons - Gemini CLI interprets them as bash commands
+_PRIOR_CONTEXT_HEADER = (
+    "[Chat context, reply to last USER message,"
+    " earlier messages are in your previous prompt]\n"
+)
+_USER_ASKS_PREFIX = "USER asks "
+_USER_ASKS_SEP = "\n" + _USER_ASKS_PREFIX
+
+# Marker the Gemini session writes before shell output (same constant)
+_SHELL_MARKER_PATTERN = re.escape(SHELL_OUTPUT_MARKER)
+
+# Shell metadata scrubbing, run on every streamed chunk: one pass, compiled once.
+# __SHELL_OUTPUT__ swallows everything after it (exit code included) and stays
+# case-sensitive; an exit code line before it is removed on its own.
+_META_STRIP_RE = re.compile(
+    rf"(?-i:{_SHELL_MARKER_PATTERN}.*)|Command exited with code:\s*\d+",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def _strip_meta(text: str) -> str:
+    """Remove shell metadata, skipping the regex when no marker is present."""
+    # Substring scans are much cheaper than the IGNORECASE pattern and copy
+    # nothing (no lower() of the whole snapshot): exit code lines come as
+    # "Command exited" or in upper case
+    if SHELL_OUTPUT_MARKER in text or "xited" in text or "XITED" in text:
+        return _META_STRIP_RE.sub("", text)
+    return text
+
+
+# Chained confirmations: exit code and output of the prior command (Gemini
+# text), found in one scan. Output stops at the first exit code line. Exit code
+# lines match in any case, also where they end the output: otherwise the scan
+# would swallow e.g. "COMMAND EXITED WITH CODE: 1" into the output and miss it.
+_PRIOR_META_RE = re.compile(
+    rf"(?-i:{_SHELL_MARKER_PATTERN})(?P<out>.*?)(?=Command exited|Error: Exit code|$)"
+    r"|(?:Command exited with code:|Error: Exit code)\s*(?P<code>\d+)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def _scan_prior_result(text: str) -> tuple[int | None, str | None, str]:
+    """Extract prior command data from result text in a single pass.
+
+    Returns:
+        (exit_code, shell_output, text without exit code lines)
+    """
+    # Literal scan first: most results carry no marker, so skip the regex
+    lowered = text.lower()
+    if (
+        SHELL_OUTPUT_MARKER not in text
+        and "command exited with code:" not in lowered
+        and "error: exit code" not in lowered
+    ):
+        return None, None, text.strip()
+    exit_code: int | None = None
+    shell_output: str | None = None
+    kept: list[str] = []
+    pos = 0
+    for match in _PRIOR_META_RE.finditer(text):
+        if (code := match["code"]) is None:
+            if shell_output is None:
+                shell_output = match["out"].strip()
+            continue
+        if exit_code is None:
+            exit_code = int(code)
+        kept.append(text[pos : match.start()])
+        pos = match.end()
+    kept.append(text[pos:])
+    return exit_code, shell_output, "".join(kept).strip()
+
+
+def _snapshot_event(snapshot: str, emitted: str) -> AssistantEvent:
+    """Event for a new response snapshot, relative to the last one emitted.
+
+    Snapshots are full re-renders: send only the new tail when the snapshot
+    extends the previous one, else the whole text (widget replaces).
+    """
+    if emitted and snapshot.startswith(emitted):
+        return AssistantEvent(content=snapshot[len(emitted) :])
+    return AssistantEvent(content=snapshot, is_snapshot=True)
+
 
 class DebateAgent:
     """Routes messages between Claude and Gemini backends."""
 
-    def __init__(self, config: VibeConfig, timeout: float = 720.0) -> None:
+    def __init__(
+        self,
+        config: VibeConfig,
+        timeout: float = 720.0,
+        emit_min_chars: int = 64,
+        emit_interval: float = 0.016,
+        history_cap: int = 500,
+    ) -> None:
         self._config = config
         self._timeout = timeout
+        # Streaming: coalesce snapshots, emit after this many new chars or seconds
+        self._emit_min_chars = emit_min_chars
+        self._emit_interval = emit_interval
 
         # Create provider configs for tmux backends
         self._claude_provider = ProviderConfig(
@@ -51,9 +160,14 @@ class DebateAgent:
         self._gemini_backend: TmuxBackend | None = None
 
         # Conversation state
-        self.messages: list[Message] = []
+        # Bounded: past history_cap messages the oldest are dropped (see
+        # _append_message), so context building never depends on debate length
+        self.messages: deque[Message] = deque(maxlen=history_cap)
         # -1 means "never responded", will see all messages from index 0
         self.last_seen: dict[str, int] = {"claude": -1, "gemini": -1}
+        # Index of the last message each AI's CLI session received in a prompt,
+        # so it is not sent again (see _unsent_context)
+        self._sent_through: dict[str, int] = {"claude": -1, "gemini": -1}
 
         # Pending confirmation state
         self._pending_confirmation: dict | None = None
@@ -93,7 +207,13 @@ class DebateAgent:
         # B59: Cleanup orphan sessions from previous crashes (once, before starting)
         await self._cleanup_orphan_sessions()
 
-        # Claude
+        # Independent sessions: start both at once (each records its own error)
+        await asyncio.gather(self._start_claude(), self._start_gemini())
+
+        return self
+
+    async def _start_claude(self) -> None:
+        """Start the Claude session, recording the error on failure."""
         try:
             self._claude_backend = TmuxBackend(
                 provider=self._claude_provider, timeout=self._timeout
@@ -103,7 +223,8 @@ class DebateAgent:
             self._claude_backend = None
             self._backend_errors["claude"] = str(e)
 
-        # Gemini
+    async def _start_gemini(self) -> None:
+        """Start the Gemini session, recording the error on failure."""
         try:
             self._gemini_backend = TmuxBackend(
                 provider=self._gemini_provider, timeout=self._timeout
@@ -113,8 +234,6 @@ class DebateAgent:
             self._gemini_backend = None
             self._backend_errors["gemini"] = str(e)
 
-        return self
-
     async def __aexit__(
         self,
         exc_type: type[BaseException] | None,
@@ -122,10 +241,13 @@ class DebateAgent:
         exc_tb: types.TracebackType | None,
     ) -> None:
         """Close both sessions."""
-        if self._claude_backend:
-            await self._claude_backend.__aexit__(exc_type, exc_val, exc_tb)
-        if self._gemini_backend:
-            await self._gemini_backend.__aexit__(exc_type, exc_val, exc_tb)
+        await asyncio.gather(
+            *(
+                backend.__aexit__(exc_type, exc_val, exc_tb)
+                for backend in (self._claude_backend, self._gemini_backend)
+                if backend
+            )
+        )
 
     def _get_backend(self, target: str) -> TmuxBackend:
         """Get backend for target."""
@@ -154,52 +276,50 @@ class DebateAgent:
         return self._config.get_active_model()
 
     async def route_message(
-        self, user_input: str, target: str | None = None
+        self, user_input: str, target: str | None = None, clean_msg: str | None = None
     ) -> AsyncGenerator[BaseEvent, None]:
         """Route message to appropriate AI and yield events.
 
         Args:
             user_input: Raw user message (may include @tag)
             target: Override target (if tag already parsed)
+            clean_msg: Message without tag (if already parsed, skips re-parsing)
 
         Yields:
             AssistantEvent with streamed content
         """
-        # Parse tag if not provided
-        logger.debug("=== route_message START === input: %s...", user_input[:50])
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("=== route_message START === input: %s...", user_input[:50])
 
-        if target is None:
-            target, clean_msg = parse_routing_tag(user_input)
-            logger.debug(
-                "parsed tag: target=%s, clean_msg=%s...", target, clean_msg[:30]
-            )
+        # Single parse, only for what the caller didn't already provide
+        if target is None or clean_msg is None:
+            parsed_target, parsed_msg = parse_routing_tag(user_input)
             if target is None:
-                # No tag - caller should show selector
-                logger.debug("NO TARGET - returning (should show selector)")
-                return
-        else:
-            _, clean_msg = parse_routing_tag(user_input)
-            logger.debug("target provided: %s, clean_msg=%s...", target, clean_msg[:30])
+                target = parsed_target
+            if clean_msg is None:
+                clean_msg = parsed_msg
+        if debug:
+            logger.debug("target: %s, clean_msg=%s...", target, clean_msg[:30])
+        if target is None:
+            # No tag - caller should show selector
+            logger.debug("NO TARGET - returning (should show selector)")
+            return
 
         # Add user message to history
-        self.messages.append(
-            Message(role="user", content=clean_msg, timestamp=datetime.now())
-        )
+        self._append_message(Message.make("user", clean_msg))
 
         # Build context for target
-        context = build_context(
-            self.messages[:-1],  # Exclude current message
-            target,
-            self.last_seen,
-        )
+        context = self._unsent_context(target)
 
         # Prepend context if any
         # B49 fix: No colons in labels - Gemini CLI interprets as bash command
         # Format: "Context:\n...\nUSER asks message" (all on same line, no colon after asks)
-        if context:
-            prompt = f"{context}\nUSER asks {clean_msg}"
-        else:
-            prompt = f"USER asks {clean_msg}"
+        prompt = (
+            "".join((context, _USER_ASKS_SEP, clean_msg))
+            if context
+            else _USER_ASKS_PREFIX + clean_msg
+        )
 
         # Log prompt for debugging (B49: shell mode trigger)
         logger.debug("=== PROMPT SENT TO %s ===", target.upper())
@@ -211,7 +331,14 @@ class DebateAgent:
         model = self._get_model_config()
         messages = [LLMMessage(role=Role.user, content=prompt)]
 
-        full_response = ""
+        # Latest accepted snapshot, cursor-free. Snapshots are full pane
+        # re-renders (earlier text can change), so the latest one is the response
+        clean_full = ""
+        # Latest displayable snapshot not yet emitted (see _emit_min_chars)
+        pending = ""
+        emitted = ""  # Last snapshot sent to the UI
+        loop = asyncio.get_running_loop()
+        last_emit = loop.time()
         logger.debug("starting streaming loop...")
 
         async for chunk in backend.complete_streaming(
@@ -223,11 +350,13 @@ class DebateAgent:
             tool_choice=None,
             extra_headers=None,
         ):
-            logger.debug(
-                "chunk received: finish_reason=%s, content_len=%d",
-                chunk.finish_reason,
-                len(chunk.message.content or ""),
-            )
+            # Hot loop: skip argument evaluation when DEBUG is off
+            if debug:
+                logger.debug(
+                    "chunk received: finish_reason=%s, content_len=%d",
+                    chunk.finish_reason,
+                    len(chunk.message.content or ""),
+                )
             if chunk.finish_reason == "confirmation":
                 logger.debug("Agent received confirmation from backend")
                 # AI confirmation - parse tool info from the confirmation context
@@ -235,8 +364,10 @@ class DebateAgent:
                 confirmation_context = chunk.message.content or ""
 
                 if confirmation_context:
-                    logger.debug("=== CONFIRMATION CONTEXT ===")
-                    logger.debug("%s", confirmation_context[:500])  # First 500 chars
+                    if debug:
+                        logger.debug("=== CONFIRMATION CONTEXT ===")
+                        # First 500 chars
+                        logger.debug("%s", confirmation_context[:500])
 
                     # Use parser for this AI
                     parser = self._get_parser(target)
@@ -257,51 +388,46 @@ class DebateAgent:
                     "target": target,
                     "context": confirmation_context,
                 }
-                # Don't yield anything - ApprovalApp will handle the UI
+                # The CLI got the prompt (user message is the last one)
+                self._sent_through[target] = len(self.messages) - 1
+                if pending:
+                    yield _snapshot_event(pending, emitted)
+                # No confirmation event - ApprovalApp will handle the UI
                 return
 
             content = chunk.message.content or ""
-            # Clean cursor
-            clean_content = content.rstrip(" ▌").rstrip("▌")
-            clean_full = full_response.rstrip(" ▌").rstrip("▌")
+            # Clean cursor (rstrip takes a set of chars: spaces and ▌ in any order)
+            clean_content = content.rstrip(" ▌")
 
             if clean_content and clean_content != clean_full:
-                full_response = content
+                clean_full = clean_content
                 # B20 fix: Clean shell markers
-                clean_content = re.sub(
-                    r"__SHELL_OUTPUT__:.*", "", clean_content, flags=re.DOTALL
-                )
-                clean_content = re.sub(
-                    r"Command exited with code:\s*\d+",
-                    "",
-                    clean_content,
-                    flags=re.IGNORECASE,
-                )
+                clean_content = _strip_meta(clean_content)
                 if clean_content.strip():
-                    # Send full content - widget will replace (not append)
-                    yield AssistantEvent(content=clean_content)
-
-        logger.debug("streaming loop DONE, full_response_len=%d", len(full_response))
+                    # Back to what the UI shows: nothing left to send
+                    pending = clean_content if clean_content != emitted else ""
+
+            if pending and (
+                len(pending) - len(emitted) >= self._emit_min_chars
+                or loop.time() - last_emit >= self._emit_interval
+            ):
+                yield _snapshot_event(pending, emitted)
+                emitted = pending
+                pending = ""
+                last_emit = loop.time()
+
+        if pending:
+            yield _snapshot_event(pending, emitted)
+        logger.debug("streaming loop DONE, full_response_len=%d", len(clean_full))
 
         # Add AI response to history
-        if full_response:
-            # B20 fix: Clean shell markers before storing
-            clean_response = re.sub(
-                r"__SHELL_OUTPUT__:.*", "", full_response, flags=re.DOTALL
-            )
-            clean_response = re.sub(
-                r"Command exited with code:\s*\d+",
-                "",
-                clean_response,
-                flags=re.IGNORECASE,
-            )
-            clean_response = clean_response.rstrip(" ▌").strip()
+        # No snapshot means the prompt never reached the CLI (dead session, error)
+        if clean_full:
+            self._sent_through[target] = len(self.messages) - 1
+            # B20 fix: Clean shell markers before storing (cursor already gone)
+            clean_response = _strip_meta(clean_full).strip()
             if clean_response:
-                self.messages.append(
-                    Message(
-                        role=target, content=clean_response, timestamp=datetime.now()
-                    )
-                )
+                self._append_message(Message.make(target, clean_response))
 
             # Update last_seen for this AI (index of last message, not length)
             self.last_seen[target] = len(self.messages) - 1
@@ -332,90 +458,45 @@ class DebateAgent:
         # Wait for response
         result = await backend.wait_response(timeout=int(self._timeout))
 
-        # B67 fix: Handle ParsedResponse (uniform format from both CLIs)
-        if isinstance(result, ParsedResponse):
-            if self._pending_tool_info and self._pending_tool_info.tool_type == "shell":
-                if result.exit_code is not None:
-                    self._pending_tool_info.exit_code = result.exit_code
-                if result.shell_output is not None:
-                    self._pending_tool_info.shell_output = result.shell_output
-            content = result.content or ""
-        elif isinstance(result, str):
-            # Fallback: backends now return ParsedResponse, but keep for safety
-            content = result
-        else:
-            content = ""
-
-        if isinstance(result, ParsedConfirmation):
-            # Chained confirmation detected - extract data from prior command first
-            prior_result = result.prior_result.content if result.prior_result else ""
-
-            # B67 fix: Use structured data if available (Claude), else parse from text (Gemini)
-            prior_exit_code = result.prior_exit_code
-            prior_shell_output = result.prior_shell_output
-
-            if self._pending_tool_info and self._pending_tool_info.tool_type == "shell":
-                # Use structured data from CLI if available
-                if prior_exit_code is not None:
-                    self._pending_tool_info.exit_code = prior_exit_code
-                if prior_shell_output is not None:
-                    self._pending_tool_info.shell_output = prior_shell_output
-
-                # Fallback: parse from prior_result text (Gemini format)
-                if prior_result and self._pending_tool_info.exit_code is None:
-                    exit_match = re.search(
-                        r"(?:Command exited with code:|Error: Exit code)\s*(\d+)",
-                        prior_result,
-                        re.IGNORECASE,
-                    )
-                    if exit_match:
-                        self._pending_tool_info.exit_code = int(exit_match.group(1))
-
-                    output_match = re.search(
-                        r"__SHELL_OUTPUT__:(.+?)(?=Command exited|$)",
-                        prior_result,
-                        re.DOTALL,
-                    )
-                    if output_match:
-                        self._pending_tool_info.shell_output = output_match.group(
-                            1
-                        ).strip()
-                    elif not self._pending_tool_info.shell_output:
-                        # Clean exit code line from output
-                        clean_output = re.sub(
-                            r"(?:Command exited with code:|Error: Exit code)\s*\d+",
-                            "",
-                            prior_result,
-                            flags=re.IGNORECASE,
-                        ).strip()
-                        if clean_output:
-                            self._pending_tool_info.shell_output = clean_output
-
-            # Yield event so app.py creates widget for cmd1
-            if self._pending_tool_info:
-                # B55: Accumulate action context for chained commands
-                self._action_contexts.append(
-                    self._build_action_context(self._pending_tool_info, target)
-                )
-                yield CLIToolResultEvent(tool_info=self._pending_tool_info)
-
-            # Parse the NEW confirmation (cmd2)
-            context = result.context
-            self._pending_confirmation = {"target": target, "context": context}
-            parser = self._get_parser(target)
-            _, self._pending_tool_info = parser.parse(context, debug=True)
-            yield AssistantEvent(content="[Another confirmation required]")
-            return
+        # B67 fix: ParsedResponse / ParsedConfirmation (uniform format from both
+        # CLIs), dispatched once
+        tool_info = self._pending_tool_info
+        match result:
+            case ParsedResponse():
+                if tool_info and tool_info.tool_type == "shell":
+                    if result.exit_code is not None:
+                        tool_info.exit_code = result.exit_code
+                    if result.shell_output is not None:
+                        tool_info.shell_output = result.shell_output
+                content = result.content or ""
+            case str():
+                # Fallback: backends now return ParsedResponse, but keep for safety
+                content = result
+            case ParsedConfirmation():
+                # Chained confirmation detected - extract data from prior command
+                if tool_info and tool_info.tool_type == "shell":
+                    self._apply_prior_result(tool_info, result)
+
+                # Yield event so app.py creates widget for cmd1
+                if tool_info:
+                    # B55: Accumulate action context for chained commands
+                    self._record_action(tool_info, target)
+                    yield CLIToolResultEvent(tool_info=tool_info)
+
+                # Parse the NEW confirmation (cmd2)
+                context = result.context
+                self._pending_confirmation = {"target": target, "context": context}
+                parser = self._get_parser(target)
+                _, self._pending_tool_info = parser.parse(context, debug=True)
+                yield AssistantEvent(content="[Another confirmation required]")
+                return
+            case _:
+                content = ""
 
         # Clean shell metadata from displayed content (shown in widget instead)
         if content:
-            # Remove __SHELL_OUTPUT__:... marker (everything after it)
-            content = re.sub(r"__SHELL_OUTPUT__:.*", "", content, flags=re.DOTALL)
-            # Remove exit code line
-            content = re.sub(
-                r"Command exited with code:\s*\d+", "", content, flags=re.IGNORECASE
-            )
-            content = content.strip()
+            # Remove __SHELL_OUTPUT__:... marker (everything after it) and exit code
+            content = _strip_meta(content).strip()
 
         # B55: Inject all action contexts into history so other AI sees diffs
         # Keep UI content separate from history content
@@ -423,9 +504,7 @@ class DebateAgent:
         history_content = content  # For other AI
 
         if self._pending_tool_info:
-            self._action_contexts.append(
-                self._build_action_context(self._pending_tool_info, target)
-            )
+            self._record_action(self._pending_tool_info, target)
 
         if self._action_contexts:
             actions_text = "\n\n".join(self._action_contexts)
@@ -435,9 +514,7 @@ class DebateAgent:
             self._action_contexts = []  # Reset for next chain
 
         if history_content:
-            self.messages.append(
-                Message(role=target, content=history_content, timestamp=datetime.now())
-            )
+            self._append_message(Message.make(target, history_content))
             self.last_seen[target] = len(self.messages) - 1
 
         if ui_content:
@@ -474,6 +551,71 @@ class DebateAgent:
         """Clear pending tool info after handling."""
         self._pending_tool_info = None
 
+    def _unsent_context(self, target: str) -> str:
+        """Build context for target, minus messages its CLI session already has.
+
+        The CLI session keeps its own history. When a turn leaves last_seen
+        unchanged (cancelled confirmation), the messages of its previous prompt
+        are not sent again: only later ones, under a header saying so.
+        """
+        seen = self.last_seen.get(target, -1)
+        sent = self._sent_through.get(target, -1)
+        context = build_context(
+            self.messages,
+            target,
+            {target: max(seen, sent)},
+            end=len(self.messages) - 1,  # Exclude current message
+        )
+        if context and sent > seen:
+            # Same instruction line, plus where the earlier messages are
+            return _PRIOR_CONTEXT_HEADER + context.partition("\n")[2]
+        return context
+
+    @staticmethod
+    def _apply_prior_result(
+        tool_info: CLIToolInfo, confirmation: ParsedConfirmation
+    ) -> None:
+        """Set exit code / output of the command before a chained confirmation.
+
+        B67 fix: Use structured data if available (Claude), else parse from
+        text (Gemini format).
+        """
+        if confirmation.prior_exit_code is not None:
+            tool_info.exit_code = confirmation.prior_exit_code
+        if confirmation.prior_shell_output is not None:
+            tool_info.shell_output = confirmation.prior_shell_output
+
+        prior_result = (
+            confirmation.prior_result.content if confirmation.prior_result else ""
+        )
+        if not prior_result or tool_info.exit_code is not None:
+            return
+        exit_code, shell_output, clean_output = _scan_prior_result(prior_result)
+        if exit_code is not None:
+            tool_info.exit_code = exit_code
+
+        if shell_output is not None:
+            tool_info.shell_output = shell_output
+        elif not tool_info.shell_output and clean_output:
+            # No marker: output is the text minus the exit code line
+            tool_info.shell_output = clean_output
+
+    def _append_message(self, message: Message) -> None:
+        """Add message to history, shifting last_seen if the oldest is dropped."""
+        if len(self.messages) == self.messages.maxlen:
+            # Indices move down by one; -1 still means "sees everything kept"
+            for ai, idx in self.last_seen.items():
+                self.last_seen[ai] = max(-1, idx - 1)
+            for ai, idx in self._sent_through.items():
+                self._sent_through[ai] = max(-1, idx - 1)
+        self.messages.append(message)
+
+    def _record_action(self, tool_info: CLIToolInfo, target: str) -> None:
+        """B55: Queue the action context of a finished tool for history."""
+        # Not cached: each tool is recorded once per chain, and exit_code /
+        # shell_output are only final at this point
+        self._action_contexts.append(self._build_action_context(tool_info, target))
+
     def _build_action_context(self, tool_info: CLIToolInfo, target: str) -> str:
         """B55: Build readable action context for history.
 
@@ -482,24 +624,31 @@ class DebateAgent:
             + line 1
             + line 2
         """
+        target_label = _TARGET_UPPER.get(target) or target.upper()
         lines = [
-            f"[{target.upper()} ACTION: {tool_info.tool_type.upper()} {tool_info.file_path}]"
+            f"[{target_label} ACTION: {tool_info.tool_type.upper()} {tool_info.file_path}]"
         ]
 
         # Diff lines (cap 50)
-        diff = tool_info.diff_lines[:50]
-        for line_type, line_content in diff:
-            prefix = line_type if line_type in {"+", "-"} else " "
-            lines.append(f"{prefix} {line_content}")
+        lines.extend(
+            f"{line_type if line_type in _DIFF_PREFIXES else ' '} {line_content}"
+            for line_type, line_content in islice(tool_info.diff_lines, 50)
+        )
         if len(tool_info.diff_lines) > 50:
             lines.append(f"... ({len(tool_info.diff_lines) - 50} more lines)")
 
-        # Shell output (cap 20)
-        if tool_info.shell_output:
-            out = tool_info.shell_output.split("\n")
-            lines.extend(out[:20])
-            if len(out) > 20:
-                lines.append(f"... ({len(out) - 20} more lines)")
+        # Shell output (cap 20): count lines once, split the kept head only
+        if output := tool_info.shell_output:
+            total = output.count("\n") + (not output.endswith("\n"))
+            if total > 20:
+                # Cut at the 20th newline so the tail is never copied
+                end = -1
+                for _ in range(20):
+                    end = output.find("\n", end + 1)
+                output = output[:end]
+            lines.extend(output.split("\n")[: min(total, 20)])
+            if total > 20:
+                lines.append(f"... ({total - 20} more lines)")
 
         if tool_info.exit_code is not None:
             lines.append(f"Exit: {tool_info.exit_code}")
@@ -517,4 +666,5 @@ class DebateAgent:
         """Clear conversation history but keep sessions alive."""
         self.messages.clear()
         self.last_seen = {"claude": -1, "gemini": -1}
+        self._sent_through = {"claude": -1, "gemini": -1}
         self._action_contexts = []  # B55: Clear stale contexts
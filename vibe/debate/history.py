@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
+from collections import deque
 from collections.abc import Iterator
-from datetime import datetime
 
 from vibe.debate.routing import Message, build_context
 
@@ -13,12 +13,13 @@ class ConversationHistory:
 
     def __init__(self, max_messages: int = 100) -> None:
         self._max_messages = max_messages
-        self._messages: list[Message] = []
+        # Oldest messages drop off automatically past max_messages
+        self._messages: deque[Message] = deque(maxlen=max_messages)
         # -1 means "never responded", will see all messages from index 0
         self._last_seen: dict[str, int] = {"claude": -1, "gemini": -1}
 
     @property
-    def messages(self) -> list[Message]:
+    def messages(self) -> deque[Message]:
         """Get all messages."""
         return self._messages
 
@@ -35,22 +36,13 @@ class ConversationHistory:
             content: Message content
             is_ephemeral: If True, message won't be included in context
         """
-        msg = Message(
-            role=role,
-            content=content,
-            timestamp=datetime.now(),
-            is_ephemeral=is_ephemeral,
-        )
+        msg = Message.make(role, content, is_ephemeral)
+        if len(self._messages) == self._max_messages:
+            # Appending drops the oldest: shift last_seen indices down by one
+            for ai, idx in self._last_seen.items():
+                self._last_seen[ai] = max(-1, idx - 1)
         self._messages.append(msg)
 
-        # Trim if over limit
-        if len(self._messages) > self._max_messages:
-            excess = len(self._messages) - self._max_messages
-            self._messages = self._messages[excess:]
-            # Adjust last_seen indices
-            for ai in self._last_seen:
-                self._last_seen[ai] = max(0, self._last_seen[ai] - excess)
-
     def get_context_for(self, target: str, limit: int = 5) -> str:
         """Get context string for target AI (messages it hasn't seen).
 
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
 import re
+import time
 
 # Target constants - single source of truth
 TARGET_CLAUDE = "claude"
@@ -31,6 +33,16 @@ ROUTING_TAGS = {
 }
 
 TAG_PATTERN = re.compile(r"(?:^|\s)@(cc|claude|g|gemini)(?=\s|$)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# B49: Context header, followed by the first message on the next line
+_CONTEXT_HEADER = "[Chat context, reply to last USER message]\n"
+# B49: Explicit names (CLAUDE/GEMINI) instead of generic "AI"
+_ROLE_LABELS_SAID = {
+    "user": "USER said",
+    TARGET_CLAUDE: "CLAUDE said",
+    TARGET_GEMINI: "GEMINI said",
+}
 
 
 def parse_routing_tag(text: str) -> tuple[str | None, str]:
@@ -44,6 +56,14 @@ def parse_routing_tag(text: str) -> tuple[str | None, str]:
         return None, ""
 
     text = text.strip()
+
+    # Fast path: tag is the first word and no other tag can follow (no "@")
+    parts = text.split(None, 1)
+    if parts and (target := ROUTING_TAGS.get(parts[0].lower())):
+        rest = parts[1] if len(parts) > 1 else ""
+        if "@" not in rest:
+            return target, " ".join(rest.split())
+
     match = TAG_PATTERN.search(text)
 
     if not match:
@@ -55,66 +75,80 @@ def parse_routing_tag(text: str) -> tuple[str | None, str]:
     # Remove the tag from message
     clean = TAG_PATTERN.sub("", text).strip()
     # Clean up extra spaces
-    clean = re.sub(r"\s+", " ", clean).strip()
+    clean = _WHITESPACE_RE.sub(" ", clean).strip()
 
     return target, clean
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Message:
-    """Single message in conversation history."""
+    """Single message in conversation history (immutable, no per-instance dict)."""
 
     role: str  # "user" | "claude" | "gemini"
     content: str
-    timestamp: datetime
+    timestamp: int  # Wall clock in ns (time.time_ns()), see dt
     is_ephemeral: bool = False
 
+    @classmethod
+    def make(cls, role: str, content: str, is_ephemeral: bool = False) -> Message:
+        """New message stamped now (time.time_ns(), no datetime object)."""
+        return cls(role, content, time.time_ns(), is_ephemeral)
+
+    @property
+    def dt(self) -> datetime:
+        """Timestamp as a local datetime, built only when displayed."""
+        return datetime.fromtimestamp(self.timestamp / 1e9)
+
 
 def build_context(
-    messages: list[Message], target: str, last_seen: dict[str, int], limit: int = 5
+    messages: Sequence[Message],
+    target: str,
+    last_seen: dict[str, int],
+    limit: int = 5,
+    end: int | None = None,
 ) -> str:
     """Build context string for target AI from messages it hasn't seen.
 
     Args:
-        messages: Full conversation history
+        messages: Full conversation history (list or deque)
         target: "claude" or "gemini"
         last_seen: {"claude": idx, "gemini": idx} - last message index each AI saw
         limit: Max messages to include
+        end: Exclusive upper index into messages (default: whole history), so
+            callers can exclude trailing messages without copying the list
 
     Returns:
         Formatted context string
     """
-    if not messages:
+    if end is None:
+        end = len(messages)
+    if end <= 0:
         return ""
 
     # last_seen_idx is the index of the last message this AI saw (its own last response)
     # -1 means never responded, so should see all messages
     last_seen_idx = last_seen.get(target, -1)
-
-    # Take everything AFTER last_seen_idx
-    new_messages = messages[last_seen_idx + 1 :]
-
-    # Cap to limit if too many
-    if len(new_messages) > limit:
-        new_messages = new_messages[-limit:]
-
-    # Filter out ephemeral messages
-    relevant = [m for m in new_messages if not m.is_ephemeral]
-
-    if not relevant:
+    if last_seen_idx >= end - 1:
+        return ""  # Already saw everything (e.g. follow-up to the same AI)
+
+    # Take everything AFTER last_seen_idx, capped to the last `limit` messages
+    # (indexed, not sliced: deques don't slice, and indexing near the end is cheap)
+    start = max(last_seen_idx + 1, end - limit)
+
+    # Filter out ephemeral messages and format the rest in the same pass
+    # B49 fix: Explicit labels so AI understands this is chat, not shell
+    msg_lines = [
+        f"{_ROLE_LABELS_SAID.get(msg.role) or _role_to_label(msg.role)} {msg.content}"
+        for i in range(start, end)
+        if not (msg := messages[i]).is_ephemeral
+    ]
+
+    if not msg_lines:
         return ""
 
-    # B49 fix: Explicit header so AI understands this is chat, not shell
-    # Double newline between each person for readability
-    lines = ["[Chat context, reply to last USER message]"]
-    for msg in relevant:
-        role_label = _role_to_label(msg.role, is_current=False)
-        lines.append(f"{role_label} {msg.content}")
-
     # Join: header + first msg with single \n, then double \n between messages
-    header = lines[0]
-    msg_lines = lines[1:]
-    return header + "\n" + "\n\n".join(msg_lines)
+    # (double newline between each person for readability)
+    return _CONTEXT_HEADER + "\n\n".join(msg_lines)
 
 
 def _role_to_label(role: str, is_current: bool = False) -> str:
@@ -123,11 +157,7 @@ def _role_to_label(role: str, is_current: bool = False) -> str:
     B49 fix: Explicit names (CLAUDE/GEMINI) instead of generic "AI".
     Format: '[Context]' header + 'USER said' / 'CLAUDE said' / 'GEMINI said'
     """
-    if role == "user":
-        return "USER asks" if is_current else "USER said"
-    elif role == "claude":
-        return "CLAUDE said"
-    elif role == "gemini":
-        return "GEMINI said"
+    if is_current and role == "user":
+        return "USER asks"
     # Fallback for unknown roles
-    return f"{role.upper()} said"
+    return _ROLE_LABELS_SAID.get(role) or f"{role.upper()} said"